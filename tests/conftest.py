@@ -1,13 +1,10 @@
 """Set up some common test helper things."""
-import functools
 import logging
 
 import pytest
-import requests_mock as _requests_mock
 
 from homeassistant import core as ha, util
 from homeassistant.auth.const import GROUP_ID_ADMIN, GROUP_ID_READ_ONLY
-from homeassistant.auth.providers import homeassistant, legacy_api_password
 from homeassistant.components import mqtt
 from homeassistant.components.websocket_api.auth import (
     TYPE_AUTH,
@@ -19,7 +16,7 @@ from homeassistant.exceptions import ServiceNotFound
 from homeassistant.setup import async_setup_component
 from homeassistant.util import location
 
-from tests.async_mock import MagicMock, patch
+from tests.async_mock import MagicMock
 from tests.ignore_uncaught_exceptions import IGNORE_UNCAUGHT_EXCEPTIONS
 
 pytest.register_assert_rewrite("tests.common")
@@ -30,42 +27,74 @@ from tests.common import (  # noqa: E402, isort:skip
     MockUser,
     async_fire_mqtt_message,
     async_test_home_assistant,
+    ensure_auth_manager_loaded,
     mock_storage as mock_storage,
 )
-from tests.test_util.aiohttp import mock_aiohttp_client  # noqa: E402, isort:skip
 
 
-logging.basicConfig(level=logging.DEBUG)
+_IGNORED_EXCEPTIONS = frozenset(IGNORE_UNCAUGHT_EXCEPTIONS)
+
+# Fixtures that set up full integrations before the test runs
+SLOW_FIXTURES = {"mqtt_mock", "hass_ws_client"}
+
+logging.getLogger().setLevel(logging.DEBUG)
 logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
 
 
+def pytest_addoption(parser):
+    """Register command line options."""
+    parser.addoption(
+        "--skip-slow", action="store_true", help="skip tests marked as slow"
+    )
+
+
 def pytest_configure(config):
-    """Register marker for tests that log exceptions."""
+    """Register markers for tests that log exceptions and slow tests."""
     config.addinivalue_line(
         "markers", "no_fail_on_log_exception: mark test to not fail on logged exception"
     )
+    config.addinivalue_line(
+        "markers", "slow: mark test as slow, skipped when running with --skip-slow"
+    )
+    # Captured runs already get every record via pytest's log capture, only
+    # format to stderr when the output is actually shown
+    if config.getoption("capture") == "no":
+        logging.basicConfig(level=logging.DEBUG)
 
 
-def check_real(func):
-    """Force a function to require a keyword _test_real to be passed in."""
+def pytest_collection_modifyitems(config, items):
+    """Mark tests using slow fixtures as slow and skip them if requested."""
+    skip_slow = config.getoption("skip_slow")
 
-    @functools.wraps(func)
-    async def guard_func(*args, **kwargs):
-        real = kwargs.pop("_test_real", None)
+    for item in items:
+        if not SLOW_FIXTURES.isdisjoint(getattr(item, "fixturenames", ())):
+            item.add_marker(pytest.mark.slow)
+
+        if skip_slow and "slow" in item.keywords:
+            item.add_marker(pytest.mark.skip(reason="slow test, --skip-slow given"))
+
+
+_async_detect_location_info = location.async_detect_location_info
+
+
+async def _guarded_detect_location_info(*args, **kwargs):
+    """Require a keyword _test_real to be passed in to detect location info."""
+    if not kwargs.pop("_test_real", None):
+        raise Exception(
+            'Forgot to mock or pass "_test_real=True" to async_detect_location_info'
+        )
 
-        if not real:
-            raise Exception(
-                'Forgot to mock or pass "_test_real=True" to %s', func.__name__
-            )
+    return await _async_detect_location_info(*args, **kwargs)
 
-        return await func(*args, **kwargs)
 
-    return guard_func
+def _get_local_ip():
+    """Return a fixed local IP instead of probing the network."""
+    return "127.0.0.1"
 
 
 # Guard a few functions that would make network connections
-location.async_detect_location_info = check_real(location.async_detect_location_info)
-util.get_local_ip = lambda: "127.0.0.1"
+location.async_detect_location_info = _guarded_detect_location_info
+util.get_local_ip = _get_local_ip
 
 
 @pytest.fixture(autouse=True)
@@ -104,12 +133,9 @@ def hass(loop, hass_storage, request):
     yield hass
 
     loop.run_until_complete(hass.async_stop(force=True))
+    if (request.module.__name__, request.function.__name__) in _IGNORED_EXCEPTIONS:
+        return
     for ex in exceptions:
-        if (
-            request.module.__name__,
-            request.function.__name__,
-        ) in IGNORE_UNCAUGHT_EXCEPTIONS:
-            continue
         if isinstance(ex, ServiceNotFound):
             continue
         raise ex
@@ -118,6 +144,9 @@ def hass(loop, hass_storage, request):
 @pytest.fixture
 def requests_mock():
     """Fixture to provide a requests mocker."""
+    # pylint: disable=import-outside-toplevel
+    import requests_mock as _requests_mock
+
     with _requests_mock.mock() as m:
         yield m
 
@@ -125,27 +154,34 @@ def requests_mock():
 @pytest.fixture
 def aioclient_mock():
     """Fixture to mock aioclient calls."""
+    # pylint: disable=import-outside-toplevel
+    from tests.test_util.aiohttp import mock_aiohttp_client
+
     with mock_aiohttp_client() as mock_session:
         yield mock_session
 
 
 @pytest.fixture
-def mock_device_tracker_conf():
+def mock_device_tracker_conf(monkeypatch):
     """Prevent device tracker from reading/writing data."""
     devices = []
 
-    async def mock_update_config(path, id, entity):
+    async def mock_update_config(tracker, path, id, entity):
         devices.append(entity)
 
-    with patch(
+    async def mock_load_config(*args):
+        return devices
+
+    monkeypatch.setattr(
         "homeassistant.components.device_tracker.legacy"
         ".DeviceTracker.async_update_config",
-        side_effect=mock_update_config,
-    ), patch(
+        mock_update_config,
+    )
+    monkeypatch.setattr(
         "homeassistant.components.device_tracker.legacy.async_load_config",
-        side_effect=lambda *args: devices,
-    ):
-        yield devices
+        mock_load_config,
+    )
+    return devices
 
 
 @pytest.fixture
@@ -166,18 +202,16 @@ def hass_owner_user(hass, local_auth):
 @pytest.fixture
 def hass_admin_user(hass, local_auth):
     """Return a Home Assistant admin user."""
-    admin_group = hass.loop.run_until_complete(
-        hass.auth.async_get_group(GROUP_ID_ADMIN)
-    )
+    ensure_auth_manager_loaded(hass.auth)
+    admin_group = hass.auth._store._groups[GROUP_ID_ADMIN]
     return MockUser(groups=[admin_group]).add_to_hass(hass)
 
 
 @pytest.fixture
 def hass_read_only_user(hass, local_auth):
     """Return a Home Assistant read only user."""
-    read_only_group = hass.loop.run_until_complete(
-        hass.auth.async_get_group(GROUP_ID_READ_ONLY)
-    )
+    ensure_auth_manager_loaded(hass.auth)
+    read_only_group = hass.auth._store._groups[GROUP_ID_READ_ONLY]
     return MockUser(groups=[read_only_group]).add_to_hass(hass)
 
 
@@ -193,6 +227,9 @@ def hass_read_only_access_token(hass, hass_read_only_user):
 @pytest.fixture
 def legacy_auth(hass):
     """Load legacy API password provider."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.auth.providers import legacy_api_password
+
     prv = legacy_api_password.LegacyApiPasswordAuthProvider(
         hass,
         hass.auth._store,
@@ -205,6 +242,9 @@ def legacy_auth(hass):
 @pytest.fixture
 def local_auth(hass):
     """Load local auth provider."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.auth.providers import homeassistant
+
     prv = homeassistant.HassAuthProvider(
         hass, hass.auth._store, {"type": "homeassistant"}
     )
@@ -231,26 +271,22 @@ def hass_ws_client(aiohttp_client, hass_access_token, hass):
 
     async def create_client(hass=hass, access_token=hass_access_token):
         """Create a websocket client."""
-        assert await async_setup_component(hass, "websocket_api", {})
+        if "websocket_api" not in hass.config.components:
+            assert await async_setup_component(hass, "websocket_api", {})
 
         client = await aiohttp_client(hass.http.app)
 
-        with patch("homeassistant.components.http.auth.setup_auth"):
-            websocket = await client.ws_connect(URL)
-            auth_resp = await websocket.receive_json()
-            assert auth_resp["type"] == TYPE_AUTH_REQUIRED
+        websocket = await client.ws_connect(URL)
+        auth_resp = await websocket.receive_json()
+        assert auth_resp["type"] == TYPE_AUTH_REQUIRED
 
-            if access_token is None:
-                await websocket.send_json(
-                    {"type": TYPE_AUTH, "access_token": "incorrect"}
-                )
-            else:
-                await websocket.send_json(
-                    {"type": TYPE_AUTH, "access_token": access_token}
-                )
+        if access_token is None:
+            await websocket.send_json({"type": TYPE_AUTH, "access_token": "incorrect"})
+        else:
+            await websocket.send_json({"type": TYPE_AUTH, "access_token": access_token})
 
-            auth_ok = await websocket.receive_json()
-            assert auth_ok["type"] == TYPE_AUTH_OK
+        auth_ok = await websocket.receive_json()
+        assert auth_ok["type"] == TYPE_AUTH_OK
 
         # wrap in client
         websocket.client = client
@@ -278,20 +314,26 @@ def mqtt_config():
 
 
 @pytest.fixture
-def mqtt_client_mock(hass):
+def mqtt_client_mock(hass, monkeypatch):
     """Fixture to mock MQTT client."""
 
     @ha.callback
     def _async_fire_mqtt_message(topic, payload, qos, retain):
         async_fire_mqtt_message(hass, topic, payload, qos, retain)
 
-    with patch("paho.mqtt.client.Client") as mock_client:
-        mock_client = mock_client.return_value
-        mock_client.connect.return_value = 0
-        mock_client.subscribe.return_value = (0, 0)
-        mock_client.unsubscribe.return_value = (0, 0)
-        mock_client.publish.side_effect = _async_fire_mqtt_message
-        yield mock_client
+    # Named so mqtt_mock does not adopt it as a child and reset its calls
+    mock_client = MagicMock(name="paho.mqtt.client.Client()")
+    mock_client.connect.return_value = 0
+    mock_client.subscribe.return_value = (0, 0)
+    mock_client.unsubscribe.return_value = (0, 0)
+    mock_client.publish.side_effect = _async_fire_mqtt_message
+
+    def _mock_client_factory(*args, **kwargs):
+        """Return the mocked client for every paho client created."""
+        return mock_client
+
+    monkeypatch.setattr("paho.mqtt.client.Client", _mock_client_factory)
+    return mock_client
 
 
 @pytest.fixture